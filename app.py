@@ -14,13 +14,22 @@ Key improvements vs original:
 
 from __future__ import annotations
 
+import gc
+import json
 import os
 import re
+import sys
+import string
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, FrozenSet, List, Set, Tuple, Optional
 
+import orjson
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import JSONProvider
 from rapidfuzz import fuzz, process
 
 # ============================================================
@@ -31,25 +40,116 @@ DATA_FOLDER = "chatbot_data"          # Folder with *.txt training files
 MAX_ANSWER_CHARS = 1300               # Hard cap for answer length to user
 MIN_FAQ_SCORE = 60                    # Min fuzzy score to accept an FAQ hit
 MIN_TOPIC_SCORE = 70                  # Min fuzzy score to accept a topic hit
+FAQ_TOPIC_BOOST = 7                   # Score boost for FAQs in the preferred topic
 NAV_TRUNC_LIMIT = 1600                # Max chars for navigation responses
+RESPONSE_CACHE_SIZE = 4096            # Max replies memoised for repeated questions
+CACHE_MAX_MSG_CHARS = 512             # Longer messages bypass the caches (keys are kept in memory)
+MATCH_CACHE_SIZE = 1024               # Max FAQ/topic/concept lookups memoised
+LOADER_WORKERS = 8                    # Threads used to read training files
 DEBUG_LOGGING = False                 # Set True if you want console logging
 
+# Title substrings that pick the dedicated topic for a canned answer
+TOPIC_TITLE_SENTINELS = ("best practice", "troubleshooting")
+
+# Domain heuristics applied after phrase/fuzzy detection, in order:
+# (test on normalised message, concept it forces, minimum score)
+CONCEPT_HEURISTICS = (
+    (lambda m: any(k in m for k in ("holiday", "annual leave", "vacation", "leave days")),
+     "annual leave", 95),
+    (lambda m: "bank holiday" in m or "public holiday" in m,
+     "bank holidays", 95),
+    (lambda m: "working time" in m or ("hours" in m and "bank" not in m),
+     "working hours", 90),
+    (lambda m: "onboard" in m or "new starter" in m or "new joiner" in m,
+     "onboarding", 88),
+)
+
+# Single-word triggers checked against the message tokens
+GREETING_WORDS = frozenset({"hello", "hi", "hey"})
+
+# Precompiled regexes used on the request path
+_WS_NL_RE = re.compile(r"\s+\n")
+_NL_WS_RE = re.compile(r"\n\s+")
+_PARA_RE = re.compile(r"[^\n]+(?:\n(?!\n)[^\n]+)*")  # runs of lines without a blank line
+
+# Substring triggers in generate_response, one alternation per check
+_GREETING_RE = re.compile("good (?:morning|afternoon|evening)")
+_MAINTENANCE_RE = re.compile("maintenance|updated|version|release notes|changelog")
+_NAVIGATION_RE = re.compile("where do i find|where can i find|where is|how do i get to|navigate to")
+
+# Loader regexes: Q:/A: markers in training files
+_QA_RE = re.compile(r"\b([QA]):", re.IGNORECASE)
+_A_SPLIT_RE = re.compile(r"\bA:", re.IGNORECASE)
+
+
+class _NormaliseTable(dict):
+    """str.translate table keeping a-z/0-9 and mapping every other code point to a space."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return " "
+
+
+_NORMALISE_TABLE = _NormaliseTable(
+    {ord(c): c for c in string.ascii_lowercase + string.digits}
+)
+
+# Same mapping as a 256-byte table for ASCII input, with lowercasing folded in
+_ASCII_NORMALISE_TABLE = bytes(
+    b if chr(b) in string.ascii_lowercase + string.digits
+    else b + 32 if chr(b) in string.ascii_uppercase
+    else 32
+    for b in range(256)
+)
+
 # Logging setup
 logging.basicConfig(
     level=logging.DEBUG if DEBUG_LOGGING else logging.INFO,
     format="[%(levelname)s] %(message)s",
 )
 logger = logging.getLogger(__name__)
+# Pin our own level so debug calls stay no-ops even if the host reconfigures root
+logger.setLevel(logging.DEBUG if DEBUG_LOGGING else logging.INFO)
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson (used by jsonify and request.get_json).
+    orjson is stricter than the stdlib json module (lone surrogate escapes, NaN),
+    so anything it rejects falls back to json to keep accepting the same input.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return json.dumps(obj)
+
+    def loads(self, s, **kwargs):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return json.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response (no str round-trip)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            body = json.dumps(obj)
+        return self._app.response_class(body, mimetype="application/json")
+
 
 # Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 
 # ============================================================
 # DATA MODELS
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class FAQEntry:
     """Represents a single FAQ question/answer block."""
     q_raw: str
@@ -58,15 +158,16 @@ class FAQEntry:
     topic_key: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Topic:
     """Represents a training topic (.txt file)."""
     key: str
     title: str
     content: str
+    title_norm: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ConceptConfig:
     """Holds synonym and mapping info for a canonical concept."""
     canonical_norm: str
@@ -80,36 +181,64 @@ class ConceptConfig:
 
 def normalise_text(text: str) -> str:
     """Lowercase and strip to alphanumeric + spaces for consistent matching."""
+    # Memoise only short inputs so long user messages aren't pinned in the cache
+    if text and len(text) > CACHE_MAX_MSG_CHARS:
+        return _normalise_text(text)
+    return _normalise_text_cached(text)
+
+
+def _normalise_text(text: str) -> str:
     if not text:
         return ""
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    # translate() maps every non-alphanumeric char to a space; split/join collapses runs
+    if text.isascii():
+        # bytes.translate is a flat table lookup, much cheaper than a dict-backed str table
+        return " ".join(text.encode("ascii").translate(_ASCII_NORMALISE_TABLE).decode("ascii").split())
+    return " ".join(text.lower().translate(_NORMALISE_TABLE).split())
+
+
+_normalise_text_cached = lru_cache(maxsize=4096)(_normalise_text)
 
 
 def to_topic_key(name: str) -> str:
-    """Turn a filename/title into an internal topic key."""
-    return normalise_text(name).replace(" ", "_")
+    """Turn a filename/title into an internal topic key (interned, as keys are shared widely)."""
+    return sys.intern(normalise_text(name).replace(" ", "_"))
 
 
 def read_file_safely(path: str) -> str:
-    """Read text file trying UTF-8 then latin-1 as fallback."""
+    """Read text file once as bytes, decoding as UTF-8 with latin-1 as fallback."""
+    with open(path, "rb") as f:
+        data = f.read()
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+        text = data.decode("utf-8")
     except UnicodeDecodeError:
-        with open(path, "r", encoding="latin-1") as f:
-            return f.read()
+        text = data.decode("latin-1")
+    # Same newline handling as text-mode reads
+    return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
 def clean_whitespace_block(text: str) -> str:
     """Reduce weird spacing so content looks better in chat."""
-    cleaned = re.sub(r"\s+\n", "\n", text.strip())
-    cleaned = re.sub(r"\n\s+", "\n", cleaned)
+    cleaned = _WS_NL_RE.sub("\n", text.strip())
+    cleaned = _NL_WS_RE.sub("\n", cleaned)
     return cleaned
 
 
+def scan_qa(text: str) -> Tuple[bool, bool, List[Tuple[int, int]]]:
+    """
+    Single pass over text for Q:/A: markers.
+    Returns (has_q, has_a, spans of every Q: marker).
+    """
+    has_a = False
+    q_spans: List[Tuple[int, int]] = []
+    for m in _QA_RE.finditer(text):
+        if m.group(1) in "Qq":
+            q_spans.append(m.span())
+        else:
+            has_a = True
+    return bool(q_spans), has_a, q_spans
+
+
 def safe_snippet(text: str, max_chars: int = MAX_ANSWER_CHARS) -> str:
     """
     Return a readable snippet up to max_chars.
@@ -119,12 +248,14 @@ def safe_snippet(text: str, max_chars: int = MAX_ANSWER_CHARS) -> str:
     if len(text) <= max_chars:
         return text
 
-    # Split by double newlines (paragraphs)
-    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    # Stream paragraphs (blank-line separated) and keep only what fits
     result_parts: List[str] = []
     current_len = 0
 
-    for p in paragraphs:
+    for match in _PARA_RE.finditer(text):
+        p = match.group().strip()
+        if not p:
+            continue
         # If adding this paragraph would exceed the max too much, stop
         if current_len + len(p) + 2 > max_chars:
             break
@@ -143,11 +274,22 @@ def safe_snippet(text: str, max_chars: int = MAX_ANSWER_CHARS) -> str:
     )
 
 
-def contains_any(msg_norm: str, words: List[str]) -> bool:
-    """True if any of the provided (already normalised) words appear in the msg."""
-    tokens = msg_norm.split()
-    token_set = set(tokens)
-    return any(w in token_set for w in words)
+def batch_scores(query: str, choices: List[str], scorer, score_cutoff: float = 0) -> List[float]:
+    """
+    Score query against every choice in a single rapidfuzz call.
+    Returns a list aligned with choices (entries below score_cutoff are 0).
+    """
+    scores = [0.0] * len(choices)
+    for _, score, idx in process.extract(
+        query, choices, scorer=scorer, processor=None, limit=None, score_cutoff=score_cutoff
+    ):
+        scores[idx] = score
+    return scores
+
+
+def contains_any(msg_tokens: Set[str], words: FrozenSet[str]) -> bool:
+    """True if any of the provided (already normalised) words are among the msg tokens."""
+    return not words.isdisjoint(msg_tokens)
 
 
 # ============================================================
@@ -167,7 +309,6 @@ class ChatbotEngine:
         self.data_folder = data_folder
 
         self.topics: Dict[str, Topic] = {}
-        self.raw_files: Dict[str, str] = {}
         self.faq_list: List[FAQEntry] = []
 
         # phrase (synonym normalised) -> canonical concept normalised
@@ -179,10 +320,69 @@ class ChatbotEngine:
         # canonical concept normalised -> topic key
         self.concept_to_topic: Dict[str, str] = {}
 
+        # Inverted index over synonym phrases (see build_phrase_index):
+        # anchor token -> phrase ids, plus per-phrase tokens/concept/score columns
+        self._phrase_postings: Dict[str, List[int]] = {}
+        self._phrase_tokens: List[Tuple[str, ...]] = []
+        self._phrase_concepts: List[int] = []  # concept ids into _canonical_list
+        self._phrase_scores: List[float] = []
+
         # Special text blocks
         self.maintenance_text: Optional[str] = None
         self.navigation_text: Optional[str] = None
 
+        # Flat candidate lists for batched fuzzy scoring (see build_search_index).
+        # FAQ fields are stored column-wise, aligned with faq_list by index.
+        self._faq_queries: Tuple[str, ...] = ()
+        self._faq_answers: Tuple[str, ...] = ()
+        self._faq_topic_rows: Dict[str, Tuple[int, ...]] = {}  # topic key -> FAQ row indices
+        self._canonical_list: List[str] = []      # concept id -> canonical name
+        self._canonical_weights: List[float] = []  # concept id -> weight
+        self._max_concept_weight: float = 1.0
+        self._topic_keys: Tuple[str, ...] = ()
+        self._topic_titles_norm: Tuple[str, ...] = ()
+        self._topic_contents: Tuple[str, ...] = ()
+        self._topic_snippets: Dict[str, str] = {}  # topic key -> safe_snippet(content)
+        self._topics_listing: str = ""
+        self._keyword_topic: Dict[str, str] = {}  # title sentinel -> first matching topic key
+
+        # Concepts with a dedicated answer template; each handler takes the message
+        self._concept_handlers: Dict[str, Callable[[str], str]] = {
+            "annual leave": lambda msg: self.answer_annual_leave(),
+            "bank holidays": self.answer_bank_holidays,
+            "working hours": lambda msg: self.answer_working_hours(),
+            "sharepoint access": lambda msg: self.answer_sharepoint_access(),
+            "sharepoint purpose": lambda msg: self.answer_sharepoint_purpose(),
+            "sharepoint use cases": lambda msg: self.answer_sharepoint_purpose(),
+            "best practices": lambda msg: self.answer_best_practices(),
+            "troubleshooting": self.answer_troubleshooting,
+            "it support": self.answer_troubleshooting,
+            "onboarding": lambda msg: self.answer_onboarding(),
+        }
+
+        # Whole-message commands with a fixed reply; each gives the same answer
+        # the checks in generate_response would reach
+        self._fast_replies: Dict[str, Callable[[], str]] = {
+            **dict.fromkeys(
+                ("hi", "hello", "hey", "good morning", "good afternoon", "good evening"),
+                self.answer_greeting,
+            ),
+            **dict.fromkeys(("thanks", "thank you"), self.answer_thanks),
+            **dict.fromkeys(
+                ("help", "help me", "how do you work", "what can you do"),
+                self.answer_capabilities,
+            ),
+            "main topics": self.list_all_topics,
+        }
+
+        # Replies are deterministic once data is loaded, so repeats are memoised.
+        # The matchers are cached too, keyed on (normalised message, topic), so
+        # canned lookups and rephrased questions skip the fuzzy scan.
+        self._cached_response = lru_cache(maxsize=RESPONSE_CACHE_SIZE)(self.generate_response)
+        self._concept_cache = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._detect_concept_norm)
+        self._faq_cache = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._search_faq_norm)
+        self._topic_cache = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._search_topics_norm)
+
         logger.info("Initialising ChatbotEngine...")
         self.load_all_training_data()
         logger.info(
@@ -203,6 +403,7 @@ class ChatbotEngine:
             key=key,
             title=title.strip(),
             content=clean_whitespace_block(content),
+            title_norm=normalise_text(title),
         )
         self.topics[key] = topic
         return key
@@ -212,7 +413,7 @@ class ChatbotEngine:
         Add canonical concept and all its phrases to the synonym table.
         Weight influences scoring priority during intent detection.
         """
-        canonical_norm = normalise_text(canonical)
+        canonical_norm = sys.intern(normalise_text(canonical))
         cfg = self.concept_configs.get(canonical_norm)
         if not cfg:
             cfg = ConceptConfig(canonical_norm=canonical_norm, weight=weight)
@@ -237,7 +438,12 @@ class ChatbotEngine:
     # PARSERS
     # --------------------------------------------------------
 
-    def parse_faq_file(self, text: str, base_name: str):
+    def parse_faq_file(
+        self,
+        text: str,
+        base_name: str,
+        q_spans: Optional[List[Tuple[int, int]]] = None,
+    ):
         """
         Parse Q/A style FAQ documents.
 
@@ -247,9 +453,20 @@ class ChatbotEngine:
             Q: alternative phrasing
             ...
             A: answer text
+
+        q_spans are the Q: marker offsets from scan_qa, if already known.
         """
         base_topic_key = to_topic_key(base_name)
-        blocks = re.split(r"\bQ:", text, flags=re.IGNORECASE)
+        if q_spans is None:
+            q_spans = scan_qa(text)[2]
+
+        # Slice between Q: markers (same blocks as re.split on them)
+        blocks: List[str] = []
+        prev = 0
+        for start, end in q_spans:
+            blocks.append(text[prev:start])
+            prev = end
+        blocks.append(text[prev:])
 
         for block in blocks:
             block = block.strip()
@@ -257,7 +474,7 @@ class ChatbotEngine:
                 continue
 
             try:
-                q_raw, a_raw = re.split(r"\bA:", block, maxsplit=1, flags=re.IGNORECASE)
+                q_raw, a_raw = _A_SPLIT_RE.split(block, maxsplit=1)
             except ValueError:
                 continue
 
@@ -267,7 +484,7 @@ class ChatbotEngine:
                 continue
 
             # Strip non-question headings
-            q_lines = [ln.strip() for ln in q_raw.splitlines() if ln.strip()]
+            q_lines = [ln for ln in map(str.strip, q_raw.splitlines()) if ln]
             question_lines = [ln for ln in q_lines if "?" in ln]
 
             question_block = " ".join(question_lines) if question_lines else q_raw
@@ -338,22 +555,27 @@ class ChatbotEngine:
             logger.warning("Training data folder '%s' not found.", self.data_folder)
             return
 
-        for filename in os.listdir(self.data_folder):
-            if not filename.lower().endswith(".txt"):
-                continue
+        # scandir yields ready-joined paths in the same order as listdir
+        with os.scandir(self.data_folder) as it:
+            entries = [
+                e for e in it if e.name.lower().endswith(".txt") and e.is_file()
+            ]
+        filenames = [e.name for e in entries]
+        paths = [e.path for e in entries]
+
+        # Read files concurrently (I/O releases the GIL); parsing stays serial
+        # because the parsers mutate engine state.
+        with ThreadPoolExecutor(max_workers=LOADER_WORKERS) as pool:
+            contents = list(pool.map(read_file_safely, paths))
 
-            path = os.path.join(self.data_folder, filename)
-            content = read_file_safely(path)
+        for filename, content in zip(filenames, contents):
             base = filename[:-4].strip()
             base_lower = base.lower()
 
-            self.raw_files[base_lower] = content
-
             # Every file becomes a topic
             topic_key = self.register_topic(base, content)
 
-            has_q = re.search(r"\bQ:", content, flags=re.IGNORECASE) is not None
-            has_a = re.search(r"\bA:", content, flags=re.IGNORECASE) is not None
+            has_q, has_a, q_spans = scan_qa(content)
 
             if "keyword" in base_lower:
                 self.parse_keywords_and_concepts(content)
@@ -369,11 +591,21 @@ class ChatbotEngine:
 
             # Parse FAQ-style entries from any Q/A-like file
             if "faq" in base_lower or (has_q and has_a):
-                self.parse_faq_file(content, base)
+                self.parse_faq_file(content, base, q_spans)
 
         # After all files are loaded, extend manual concepts and link to topics
         self.add_manual_concepts()
+        self.build_phrase_index()
+        self.build_search_index()
         self.build_concept_to_topic_mapping()
+        self.clear_caches()
+
+    def clear_caches(self):
+        """Drop memoised replies and matches; call after changing loaded data."""
+        self._cached_response.cache_clear()
+        self._concept_cache.cache_clear()
+        self._faq_cache.cache_clear()
+        self._topic_cache.cache_clear()
 
     # --------------------------------------------------------
     # MANUAL CONCEPTS & MAPPING
@@ -551,25 +783,18 @@ class ChatbotEngine:
         if not concepts or not self.topics:
             return
 
-        topic_items = list(self.topics.items())  # (key, Topic)
-
-        # Basic fuzzy matching concept -> topic title
+        # Basic fuzzy matching concept -> topic title (one rapidfuzz call per concept)
         for concept in concepts:
             c_norm = normalise_text(concept)
-            best_topic_key: Optional[str] = None
-            best_score = 0
-
-            for key, topic in topic_items:
-                score = fuzz.token_set_ratio(c_norm, normalise_text(topic.title))
-                if score > best_score:
-                    best_score = score
-                    best_topic_key = key
-
-            if best_topic_key and best_score >= 60:
-                self.concept_to_topic[c_norm] = best_topic_key
+            hit = process.extractOne(
+                c_norm, self._topic_titles_norm,
+                scorer=fuzz.token_set_ratio, processor=None, score_cutoff=60,
+            )
+            if hit:
+                self.concept_to_topic[c_norm] = self._topic_keys[hit[2]]
 
         # Helpful manual overrides based on known filenames
-        topic_by_name = {normalise_text(t.title): k for k, t in self.topics.items()}
+        topic_by_name = {t.title_norm: k for k, t in self.topics.items()}
 
         wtr_key = topic_by_name.get("working time regulations")
         if wtr_key:
@@ -606,6 +831,67 @@ class ChatbotEngine:
         if doc_access_key:
             self.concept_to_topic[normalise_text("document access")] = doc_access_key
 
+    def build_phrase_index(self):
+        """
+        Index every synonym phrase under its rarest token so detect_concept
+        only verifies phrases that share a token with the message.
+        Built once all concepts are registered, as weights can still change.
+        """
+        # Concept ids are positions in concept_configs; scoring works on ids
+        # and only the winner is turned back into its name.
+        self._canonical_list = list(self.concept_configs.keys())
+        self._canonical_weights = [cfg.weight for cfg in self.concept_configs.values()]
+        self._max_concept_weight = max(self._canonical_weights, default=1.0)
+        concept_ids = {name: i for i, name in enumerate(self._canonical_list)}
+
+        token_freq = Counter(
+            tok for phrase_norm in self.concept_synonyms for tok in set(phrase_norm.split())
+        )
+
+        self._phrase_postings = {}
+        self._phrase_tokens = []
+        self._phrase_concepts = []
+        self._phrase_scores = []
+
+        # Phrase ids follow concept_synonyms order, which decides ties
+        for phrase_id, (phrase_norm, concept_norm) in enumerate(self.concept_synonyms.items()):
+            tokens = tuple(sys.intern(tok) for tok in phrase_norm.split())
+            concept_id = concept_ids[concept_norm]
+
+            self._phrase_tokens.append(tokens)
+            self._phrase_concepts.append(concept_id)
+            self._phrase_scores.append(len(phrase_norm) * 4 * self._canonical_weights[concept_id])
+
+            anchor = min(tokens, key=token_freq.__getitem__)
+            self._phrase_postings.setdefault(anchor, []).append(phrase_id)
+
+    def build_search_index(self):
+        """Precompute the candidate lists scored against every user query."""
+        self._faq_queries = tuple(entry.q_norm for entry in self.faq_list)
+        # Answers are stored ready to send (safe_snippet already applied)
+        self._faq_answers = tuple(safe_snippet(entry.a) for entry in self.faq_list)
+        topic_rows: Dict[str, List[int]] = {}
+        for idx, entry in enumerate(self.faq_list):
+            topic_rows.setdefault(entry.topic_key, []).append(idx)
+        self._faq_topic_rows = {key: tuple(rows) for key, rows in topic_rows.items()}
+        self._topic_keys = tuple(self.topics.keys())
+        self._topic_titles_norm = tuple(t.title_norm for t in self.topics.values())
+        self._topic_contents = tuple(t.content for t in self.topics.values())
+        self._topic_snippets = {key: safe_snippet(t.content) for key, t in self.topics.items()}
+
+        # The topic list reply only changes when data is reloaded
+        lines = ["Here are the main topics I can help with:\n"]
+        for topic in sorted(self.topics.values(), key=lambda t: t.title.lower()):
+            lines.append(f"• {topic.title}")
+        self._topics_listing = "\n".join(lines)
+
+        self._keyword_topic = {}
+        for key, topic in self.topics.items():
+            title_lower = topic.title.lower()
+            for sentinel in TOPIC_TITLE_SENTINELS:
+                if sentinel in title_lower:
+                    self._keyword_topic.setdefault(sentinel, key)
+
     # --------------------------------------------------------
     # INTENT DETECTION
     # --------------------------------------------------------
@@ -618,54 +904,66 @@ class ChatbotEngine:
         - HR-specific heuristic boosts
         """
         msg_norm = normalise_text(user_message)
+        if len(msg_norm) > CACHE_MAX_MSG_CHARS:
+            return self._detect_concept_norm(msg_norm)
+        return self._concept_cache(msg_norm)
+
+    def _detect_concept_norm(self, msg_norm: str) -> Tuple[Optional[str], Optional[str], int]:
+        """Uncached body of detect_concept; takes an already normalised message."""
         if not msg_norm:
             return None, None, 0
 
-        best_concept: Optional[str] = None
+        best_id = -1
         best_score: float = 0.0
 
         # 1) Direct phrase detection (prioritise longer phrases)
-        msg_padded = f" {msg_norm} "
-        for phrase_norm, concept_norm in self.concept_synonyms.items():
-            # approximate word-boundary check
-            if f" {phrase_norm} " in msg_padded:
-                length_factor = len(phrase_norm)
-                cfg = self.concept_configs.get(concept_norm)
-                weight = cfg.weight if cfg else 1.0
-                score = length_factor * 4 * weight
-                if score > best_score:
-                    best_score = score
-                    best_concept = concept_norm
-
-        # 2) Fuzzy matching against canonical concepts
-        canonical_list = list(self.concept_configs.keys())
-        if canonical_list:
-            fuzzy_best, fuzzy_score, _ = process.extractOne(
-                msg_norm, canonical_list, scorer=fuzz.token_set_ratio
+        msg_tokens = msg_norm.split()
+        token_positions: Dict[str, List[int]] = {}
+        for pos, tok in enumerate(msg_tokens):
+            token_positions.setdefault(tok, []).append(pos)
+
+        candidate_ids = set()
+        for tok in token_positions:
+            candidate_ids.update(self._phrase_postings.get(tok, ()))
+
+        for phrase_id in sorted(candidate_ids):
+            # whole-token match: phrase tokens appear contiguously in the message
+            phrase_tokens = self._phrase_tokens[phrase_id]
+            n = len(phrase_tokens)
+            if not any(
+                tuple(msg_tokens[pos:pos + n]) == phrase_tokens
+                for pos in token_positions.get(phrase_tokens[0], ())
+            ):
+                continue
+            score = self._phrase_scores[phrase_id]
+            if score > best_score:
+                best_score = score
+                best_id = self._phrase_concepts[phrase_id]
+
+        # 2) Fuzzy matching against canonical concepts.
+        # A fuzzy hit only wins if score * weight > best_score, so anything
+        # under best_score / max weight is pruned (1 point of slack for
+        # float rounding); a long direct phrase skips the scan entirely.
+        cutoff = max(0.0, best_score / self._max_concept_weight - 1)
+        if self._canonical_list and cutoff <= 100:
+            hit = process.extractOne(
+                msg_norm, self._canonical_list,
+                scorer=fuzz.token_set_ratio, processor=None, score_cutoff=cutoff,
             )
-            cfg = self.concept_configs.get(fuzzy_best)
-            if cfg:
-                fuzzy_score *= cfg.weight
-            if fuzzy_score > best_score:
-                best_score = fuzzy_score
-                best_concept = fuzzy_best
-
-        # 3) Domain heuristics (holidays, onboarding, etc.)
-        if any(k in msg_norm for k in ("holiday", "annual leave", "vacation", "leave days")):
-            best_concept = normalise_text("annual leave")
-            best_score = max(best_score, 95)
-
-        if "bank holiday" in msg_norm or "public holiday" in msg_norm:
-            best_concept = normalise_text("bank holidays")
-            best_score = max(best_score, 95)
-
-        if "working time" in msg_norm or ("hours" in msg_norm and "bank" not in msg_norm):
-            best_concept = normalise_text("working hours")
-            best_score = max(best_score, 90)
-
-        if "onboard" in msg_norm or "new starter" in msg_norm or "new joiner" in msg_norm:
-            best_concept = normalise_text("onboarding")
-            best_score = max(best_score, 88)
+            if hit:
+                _, fuzzy_score, fuzzy_id = hit
+                fuzzy_score *= self._canonical_weights[fuzzy_id]
+                if fuzzy_score > best_score:
+                    best_score = fuzzy_score
+                    best_id = fuzzy_id
+
+        best_concept: Optional[str] = self._canonical_list[best_id] if best_id >= 0 else None
+
+        # 3) Domain heuristics (holidays, onboarding, etc.); later rules override
+        for matches, concept, floor in CONCEPT_HEURISTICS:
+            if matches(msg_norm):
+                best_concept = concept
+                best_score = max(best_score, floor)
 
         if not best_concept:
             return None, None, 0
@@ -688,29 +986,32 @@ class ChatbotEngine:
         - Small boost if FAQ belongs to preferred_topic
         - Returns a single concise A: block
         """
-        if not self.faq_list:
-            return None
-
         msg_norm = normalise_text(msg)
-        best_entry: Optional[FAQEntry] = None
-        best_score: float = 0.0
+        if len(msg_norm) > CACHE_MAX_MSG_CHARS:
+            return self._search_faq_norm(msg_norm, preferred_topic)
+        return self._faq_cache(msg_norm, preferred_topic)
 
-        for entry in self.faq_list:
-            score1 = fuzz.token_set_ratio(msg_norm, entry.q_norm)
-            score2 = fuzz.partial_ratio(msg_norm, entry.q_norm)
-            score = max(score1, score2)
+    def _search_faq_norm(self, msg_norm: str, preferred_topic: Optional[str]) -> Optional[str]:
+        """Uncached body of search_faq_for_answer."""
+        if not self.faq_list:
+            return None
 
-            if preferred_topic and entry.topic_key == preferred_topic:
-                score += 7  # local topic boost
+        # Entries this far below the threshold cannot win even with the topic boost
+        cutoff = MIN_FAQ_SCORE - FAQ_TOPIC_BOOST
+        token_scores = batch_scores(msg_norm, self._faq_queries, fuzz.token_set_ratio, cutoff)
+        partial_scores = batch_scores(msg_norm, self._faq_queries, fuzz.partial_ratio, cutoff)
+        scores = list(map(max, token_scores, partial_scores))
 
-            if score > best_score:
-                best_score = score
-                best_entry = entry
+        if preferred_topic:
+            for idx in self._faq_topic_rows.get(preferred_topic, ()):
+                scores[idx] += FAQ_TOPIC_BOOST  # local topic boost
 
-        if not best_entry or best_score < MIN_FAQ_SCORE:
+        # max() keeps the first of equal scores, so earlier FAQs win ties
+        best_idx = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best_idx] < MIN_FAQ_SCORE:
             return None
 
-        return safe_snippet(best_entry.a)
+        return self._faq_answers[best_idx]
 
     def search_topics_for_answer(
         self,
@@ -723,52 +1024,51 @@ class ChatbotEngine:
 
         Returns a snippet, never a giant wall of text.
         """
+        msg_norm = normalise_text(msg)
+        if len(msg_norm) > CACHE_MAX_MSG_CHARS:
+            return self._search_topics_norm(msg_norm, preferred_topic)
+        return self._topic_cache(msg_norm, preferred_topic)
+
+    def _search_topics_norm(self, msg_norm: str, preferred_topic: Optional[str]) -> Optional[str]:
+        """Uncached body of search_topics_for_answer."""
         if not self.topics:
             return None
 
-        msg_norm = normalise_text(msg)
-
         # 1) If we already have a strongly suggested topic, use that first
         if preferred_topic and preferred_topic in self.topics:
-            content = self.topics[preferred_topic].content
-            if content:
-                return safe_snippet(content)
+            if self.topics[preferred_topic].content:
+                return self._topic_snippets[preferred_topic]
 
         # 2) Fuzzy match on titles
-        titles_norm = [normalise_text(t.title) for t in self.topics.values()]
-        best_title_norm, score_title, _ = process.extractOne(
-            msg_norm, titles_norm, scorer=fuzz.token_set_ratio
-        )
-
         chosen_key: Optional[str] = None
-        if score_title >= MIN_TOPIC_SCORE:
-            for key, topic in self.topics.items():
-                if normalise_text(topic.title) == best_title_norm:
-                    chosen_key = key
-                    break
+        title_hit = process.extractOne(
+            msg_norm, self._topic_titles_norm,
+            scorer=fuzz.token_set_ratio, processor=None, score_cutoff=MIN_TOPIC_SCORE,
+        )
+        if title_hit:
+            # extractOne keeps the first of equal scores, i.e. the first topic
+            # whose title normalises to the best match
+            chosen_key = self._topic_keys[title_hit[2]]
 
         # 3) If no strong title, fuzzy match on content
         if not chosen_key:
-            contents = [t.content for t in self.topics.values()]
-            best_content, score_content, idx = process.extractOne(
-                msg_norm, contents, scorer=fuzz.partial_ratio
+            content_hit = process.extractOne(
+                msg_norm, self._topic_contents,
+                scorer=fuzz.partial_ratio, processor=None, score_cutoff=MIN_TOPIC_SCORE,
             )
-            if score_content >= MIN_TOPIC_SCORE:
-                chosen_key = list(self.topics.keys())[idx]
+            if content_hit:
+                chosen_key = self._topic_keys[content_hit[2]]
 
         if not chosen_key:
             return None
 
-        return safe_snippet(self.topics[chosen_key].content)
+        return self._topic_snippets[chosen_key]
 
     def list_all_topics(self) -> str:
         if not self.topics:
             return "I don't have any topics loaded yet. Please check the training data folder."
 
-        lines = ["Here are the main topics I can help with:\n"]
-        for topic in sorted(self.topics.values(), key=lambda t: t.title.lower()):
-            lines.append(f"• {topic.title}")
-        return "\n".join(lines)
+        return self._topics_listing
 
     @staticmethod
     def extract_navigation_target(msg: str) -> Optional[str]:
@@ -798,6 +1098,40 @@ class ChatbotEngine:
     # ANSWER TEMPLATES
     # --------------------------------------------------------
 
+    @staticmethod
+    def answer_greeting() -> str:
+        return (
+            "Hi! I’m your IPA Hub Navigation Assistant 👋\n\n"
+            "You can ask me about:\n"
+            "• Annual leave and working time policies\n"
+            "• Where to find templates, tools, or training\n"
+            "• What you can access on the IPA SharePoint Hub\n"
+            "• Troubleshooting issues (access, errors, broken links)\n\n"
+            "Try something like: *How many annual leave days do I get?* or "
+            "*Where do I find onboarding resources?*"
+        )
+
+    @staticmethod
+    def answer_thanks() -> str:
+        return (
+            "You’re welcome! 😊\n\n"
+            "If you have another question about the IPA Hub, SharePoint, HR topics, or navigation, "
+            "just type it and I’ll help you again."
+        )
+
+    @staticmethod
+    def answer_capabilities() -> str:
+        return (
+            "I can help you navigate the IPA SharePoint Hub and answer common questions.\n\n"
+            "You can ask me to:\n"
+            "• Explain **why we use SharePoint** or what it allows you to access\n"
+            "• Find **templates, governance packs, or training pages**\n"
+            "• Clarify **annual leave**, **bank holidays** and **working time** policies (HR-safe guidance)\n"
+            "• Provide **troubleshooting tips** if something is not working\n"
+            "• Explain **how to use SharePoint effectively** (best practices, collaboration, integrations)\n\n"
+            "You can also type **main topics** to see everything I know."
+        )
+
     @staticmethod
     def answer_annual_leave() -> str:
         return (
@@ -885,9 +1219,9 @@ class ChatbotEngine:
 
     def answer_best_practices(self) -> str:
         # try dedicated topic if exists
-        for topic in self.topics.values():
-            if "best practice" in topic.title.lower():
-                return safe_snippet(topic.content)
+        key = self._keyword_topic.get("best practice")
+        if key:
+            return self._topic_snippets[key]
 
         return (
             "✅ **IPA SharePoint Best Practices**\n\n"
@@ -905,9 +1239,9 @@ class ChatbotEngine:
         if faq_ans:
             return faq_ans
 
-        for topic in self.topics.values():
-            if "troubleshooting" in topic.title.lower():
-                return safe_snippet(topic.content)
+        key = self._keyword_topic.get("troubleshooting")
+        if key:
+            return self._topic_snippets[key]
 
         return (
             "🛠️ **SharePoint Troubleshooting – Quick Checks**\n\n"
@@ -946,6 +1280,14 @@ class ChatbotEngine:
     # MAIN RESPONSE LOGIC
     # --------------------------------------------------------
 
+    def respond(self, user_message: str) -> str:
+        """Cached entry point: identical questions (ignoring case/padding) skip matching."""
+        key = user_message.strip().lower()
+        if len(key) > CACHE_MAX_MSG_CHARS:
+            # Don't pin oversized messages in the cache
+            return self.generate_response(key)
+        return self._cached_response(key)
+
     def generate_response(self, user_message: str) -> str:
         msg = user_message.strip()
         msg_norm = normalise_text(msg)
@@ -956,59 +1298,35 @@ class ChatbotEngine:
                 "and I’ll do my best to help."
             )
 
-        tokens = msg_norm.split()
+        # Exact one-line commands skip every other check
+        fast = self._fast_replies.get(msg_norm)
+        if fast:
+            return fast()
+
+        msg_tokens = set(msg_norm.split())
 
         # Greetings / small talk
-        if any(t in tokens for t in ("hello", "hi", "hey")) or \
-           "good morning" in msg_norm or "good afternoon" in msg_norm or "good evening" in msg_norm:
-            return (
-                "Hi! I’m your IPA Hub Navigation Assistant 👋\n\n"
-                "You can ask me about:\n"
-                "• Annual leave and working time policies\n"
-                "• Where to find templates, tools, or training\n"
-                "• What you can access on the IPA SharePoint Hub\n"
-                "• Troubleshooting issues (access, errors, broken links)\n\n"
-                "Try something like: *How many annual leave days do I get?* or "
-                "*Where do I find onboarding resources?*"
-            )
+        if contains_any(msg_tokens, GREETING_WORDS) or _GREETING_RE.search(msg_norm):
+            return self.answer_greeting()
 
         # Thanks / closing
-        if "thank" in msg_norm or "thanks" in msg_norm:
-            return (
-                "You’re welcome! 😊\n\n"
-                "If you have another question about the IPA Hub, SharePoint, HR topics, or navigation, "
-                "just type it and I’ll help you again."
-            )
+        if "thank" in msg_norm:  # also covers "thanks"
+            return self.answer_thanks()
 
         # Capabilities / help
         if "what can you do" in msg_norm or msg_norm in ("help", "help me", "how do you work"):
-            return (
-                "I can help you navigate the IPA SharePoint Hub and answer common questions.\n\n"
-                "You can ask me to:\n"
-                "• Explain **why we use SharePoint** or what it allows you to access\n"
-                "• Find **templates, governance packs, or training pages**\n"
-                "• Clarify **annual leave**, **bank holidays** and **working time** policies (HR-safe guidance)\n"
-                "• Provide **troubleshooting tips** if something is not working\n"
-                "• Explain **how to use SharePoint effectively** (best practices, collaboration, integrations)\n\n"
-                "You can also type **main topics** to see everything I know."
-            )
+            return self.answer_capabilities()
 
         # Main topics list
         if "main topics" in msg_norm or ("what" in msg_norm and "topics" in msg_norm):
             return self.list_all_topics()
 
         # Maintenance / updates
-        if any(
-            k in msg_norm
-            for k in ("maintenance", "updated", "version", "release notes", "changelog")
-        ):
+        if _MAINTENANCE_RE.search(msg_norm):
             return self.answer_maintenance()
 
         # Navigation-specific wording
-        if any(
-            k in msg_norm
-            for k in ("where do i find", "where can i find", "where is", "how do i get to", "navigate to")
-        ):
+        if _NAVIGATION_RE.search(msg_norm):
             target = self.extract_navigation_target(msg)
             # Prefer conceptual/topic-aware search if we can isolate target
             if target:
@@ -1025,31 +1343,13 @@ class ChatbotEngine:
 
         # --- Core concept detection ---
         concept, topic_key, concept_score = self.detect_concept(msg)
-        logger.debug("Concept detected: %s (topic=%s, score=%s)", concept, topic_key, concept_score)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Concept detected: %s (topic=%s, score=%s)", concept, topic_key, concept_score)
 
         if concept:
-            if concept == normalise_text("annual leave"):
-                return self.answer_annual_leave()
-            if concept == normalise_text("bank holidays"):
-                return self.answer_bank_holidays(msg)
-            if concept == normalise_text("working hours"):
-                return self.answer_working_hours()
-            if concept == normalise_text("sharepoint access"):
-                return self.answer_sharepoint_access()
-            if concept in (
-                normalise_text("sharepoint purpose"),
-                normalise_text("sharepoint use cases"),
-            ):
-                return self.answer_sharepoint_purpose()
-            if concept == normalise_text("best practices"):
-                return self.answer_best_practices()
-            if concept in (
-                normalise_text("troubleshooting"),
-                normalise_text("it support"),
-            ):
-                return self.answer_troubleshooting(msg)
-            if concept == normalise_text("onboarding"):
-                return self.answer_onboarding()
+            handler = self._concept_handlers.get(concept)
+            if handler:
+                return handler(msg)
 
             # All other concepts (document access, collaboration, training, etc.)
             if topic_key and topic_key in self.topics:
@@ -1091,6 +1391,11 @@ class ChatbotEngine:
 
 engine = ChatbotEngine(DATA_FOLDER)
 
+# The corpus is read-only from here on. Moving it out of the GC's reach keeps
+# collections from touching its pages, so workers forked by `gunicorn --preload`
+# keep sharing them copy-on-write.
+gc.freeze()
+
 
 # ============================================================
 # FLASK ROUTES
@@ -1109,7 +1414,7 @@ def get_reply():
     """
     data = request.get_json(force=True, silent=True) or {}
     user_message = data.get("message", "") or ""
-    reply = engine.generate_response(user_message)
+    reply = engine.respond(user_message)
     return jsonify({"reply": reply})
 
 
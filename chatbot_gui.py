@@ -6,37 +6,51 @@ from PIL import Image, ImageTk
 import hashlib
 import re
 import random
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 
 # --- Utility Functions ---
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
 def is_valid_email(email):
-    return re.match(r"[^@]+@[^@]+\.[^@]+", email)
+    return _EMAIL_RE.match(email)
+
+def read_text_file(filepath):
+    """Read a text file once as bytes, decoding as UTF-8 and falling back to latin-1."""
+    with open(filepath, 'rb') as file:
+        data = file.read()
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')
+    # Same newline handling as text-mode reads
+    return text.replace('\r\n', '\n').replace('\r', '\n')
 
 def load_chatbot_data():
-    """Load main chatbot topics from chatbot_data folder."""
-    responses = {}
+    """
+    Index main chatbot topics from chatbot_data folder (keyword -> file path).
+    File contents are only read the first time a topic is answered.
+    """
+    topic_files = {}
     data_folder = "chatbot_data"
     if os.path.isdir(data_folder):
-        for filename in os.listdir(data_folder):
-            if filename.endswith(".txt"):
-                filepath = os.path.join(data_folder, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as file:
-                        content = file.read()
-                except UnicodeDecodeError:
-                    with open(filepath, 'r', encoding='latin-1') as file:
-                        content = file.read()
-                keyword = filename.replace(".txt", "").lower()
-                responses[keyword] = content
-    return responses
+        with os.scandir(data_folder) as it:
+            for entry in it:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    keyword = sys.intern(entry.name.replace(".txt", "").lower())
+                    topic_files[keyword] = entry.path
+    return topic_files
 
 # --- Knowledge Base ---
 
-# Load main topics from text files
-main_topics = load_chatbot_data()
+# Index main topics from text files
+main_topic_files = load_chatbot_data()
 
 # Add side topics manually
 side_topics = {
@@ -47,8 +61,48 @@ side_topics = {
     "vacation policy": "Employees receive 20 vacation days annually, plus public holidays."
 }
 
-# Combine both
-chatbot_knowledge = {**main_topics, **side_topics}
+# Combine both (file-backed topics start as None until first read)
+chatbot_knowledge = {**dict.fromkeys(main_topic_files), **side_topics}
+
+def get_topic_content(keyword):
+    """Return the text for a knowledge keyword, reading its file on first use."""
+    content = chatbot_knowledge[keyword]
+    if content is None:
+        content = chatbot_knowledge[keyword] = read_text_file(main_topic_files[keyword])
+    return content
+
+# --- Keyword Matcher ---
+
+# One alternation over every topic keyword, wrapped in a lookahead so that
+# overlapping hits are all reported in a single pass over the query.
+_KEYWORDS = tuple(chatbot_knowledge)
+_KEYWORD_ORDER = {keyword: i for i, keyword in enumerate(_KEYWORDS)}
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in _KEYWORDS) + "))"
+) if _KEYWORDS else None
+
+# All keywords joined by newlines (which never occur inside a query), plus the
+# offset where each keyword starts, so "text in keyword" is one str.find call.
+_KEYWORD_BLOB = "\n".join(_KEYWORDS)
+_KEYWORD_STARTS = list(accumulate((len(k) + 1 for k in _KEYWORDS[:-1]), initial=0))
+
+def find_first_keyword(text):
+    """Return the first knowledge keyword (in dict order) contained in text, else None."""
+    if _KEYWORD_RE is None:
+        return None
+    hits = [m.group(1) for m in _KEYWORD_RE.finditer(text)]
+    if not hits:
+        return None
+    return min(hits, key=_KEYWORD_ORDER.__getitem__)
+
+def find_first_keyword_containing(text):
+    """Return the first knowledge keyword (in dict order) that contains text, else None."""
+    if not _KEYWORDS or "\n" in text:
+        return None
+    pos = _KEYWORD_BLOB.find(text)
+    if pos == -1:
+        return None
+    return _KEYWORDS[bisect_right(_KEYWORD_STARTS, pos) - 1]
 
 # --- Intents ---
 
@@ -63,18 +117,61 @@ intents = {
     "small_talk": ["thanks", "thank you", "cool", "great", "awesome", "nice", "perfect"]
 }
 
+# One compiled alternation per intent, built once so match_intent is a single scan
+_INTENT_RE = {
+    key: re.compile("|".join(re.escape(phrase.lower().strip()) for phrase in phrases))
+    for key, phrases in intents.items() if phrases
+}
+
 # --- Jokes ---
 
+# Module-local generator for the randomised replies (greetings, jokes, small talk)
+_rng = random.Random()
+
 jokes = [
     "Why did the PLC go to therapy? Because it had too many unresolved inputs! 😄",
     "Why don't electricians ever get lost? Because they always follow the current! ⚡",
     "I'm reading a book on anti-gravity... It's impossible to put down. 😆"
 ]
 
+# Canned replies picked at random for greetings and small talk
+_GREETING_REPLIES = (
+    "Hey there! 👋 Ready to explore Schneider Electric together?",
+    "Hi! I'm your digital onboarding buddy here to help with all things Schneider ⚡",
+    "Hello! How can I assist with your Schneider journey today?"
+)
+
+_SMALL_TALK_REPLIES = (
+    "You're most welcome! 😊 Let me know if there's anything else you need.",
+    "Anytime! I'm here to help ⚡",
+    "Glad I could help! Ask away if you need more info."
+)
+
+# Topic list reply, built once since the knowledge base is fixed after load
+_TOPICS_REPLY = (
+    "📚 Here's what I can help you with:\n\n"
+    + "\n".join(f"• {key.title()}" for key in chatbot_knowledge)
+    + "\n\n"
+    "Just type a topic name or ask me about it like 'Tell me about office hours'."
+)
+
 # --- Helper Functions ---
 
 def match_intent(query, intent_key):
-    return any(phrase in query for phrase in intents.get(intent_key, []))
+    pattern = _INTENT_RE.get(intent_key)
+    return pattern is not None and pattern.search(query) is not None
+
+# Patterns for extracting topic after common phrases (compiled once at import)
+_TOPIC_PATTERNS = tuple(re.compile(p) for p in (
+    r"tell me about (.+)",
+    r"show me (.+)",
+    r"give info on (.+)",
+    r"what is (.+)",
+    r"details on (.+)",
+    r"(.+) info",
+    r"info about (.+)",
+    r"explain (.+)"
+))
 
 def extract_topic_from_query(query):
     """
@@ -88,27 +185,33 @@ def extract_topic_from_query(query):
     - "<topic> info"
     Returns the matched topic keyword if found, else None.
     """
-    # Patterns for extracting topic after common phrases
-    patterns = [
-        r"tell me about (.+)",
-        r"show me (.+)",
-        r"give info on (.+)",
-        r"what is (.+)",
-        r"details on (.+)",
-        r"(.+) info",
-        r"info about (.+)",
-        r"explain (.+)"
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, query)
+    for pattern in _TOPIC_PATTERNS:
+        match = pattern.search(query)
         if match:
             candidate = match.group(1).strip().lower()
-            # Try to find a best matching topic from chatbot_knowledge
-            for topic in chatbot_knowledge.keys():
-                if topic in candidate or candidate in topic:
-                    return topic
+            # Try to find a best matching topic from chatbot_knowledge: the
+            # first topic that is contained in, or contains, the candidate
+            matches = [
+                topic for topic in (
+                    find_first_keyword(candidate),
+                    find_first_keyword_containing(candidate),
+                ) if topic
+            ]
+            if matches:
+                return min(matches, key=_KEYWORD_ORDER.__getitem__)
     return None
 
+@lru_cache(maxsize=1024)
+def match_topic(query):
+    """
+    Topic keyword for a query: a 'tell me about ...' style topic first, else the
+    first known keyword in the query. Cached, as the knowledge base is fixed once loaded.
+    """
+    extracted_topic = extract_topic_from_query(query)
+    if extracted_topic and extracted_topic in chatbot_knowledge:
+        return extracted_topic
+    return find_first_keyword(query)
+
 # --- Chatbot Logic ---
 
 def get_bot_response(query: str) -> str:
@@ -116,11 +219,7 @@ def get_bot_response(query: str) -> str:
 
     # 1. Greetings
     if match_intent(query, "greetings"):
-        return random.choice([
-            "Hey there! 👋 Ready to explore Schneider Electric together?",
-            "Hi! I'm your digital onboarding buddy here to help with all things Schneider ⚡",
-            "Hello! How can I assist with your Schneider journey today?"
-        ])
+        return _rng.choice(_GREETING_REPLIES)
 
     # 2. How are you?
     if match_intent(query, "how_are_you"):
@@ -146,7 +245,7 @@ def get_bot_response(query: str) -> str:
 
     # 5. Tell a joke
     if match_intent(query, "joke"):
-        return random.choice(jokes)
+        return _rng.choice(jokes)
 
     # 6. What is Schneider Electric?
     if match_intent(query, "company_info"):
@@ -159,32 +258,19 @@ def get_bot_response(query: str) -> str:
     # 7. Show available topics (main + side)
     if match_intent(query, "topics"):
         if chatbot_knowledge:
-            topics = "\n".join(f"• {key.title()}" for key in chatbot_knowledge)
-            return (
-                "📚 Here's what I can help you with:\n\n"
-                f"{topics}\n\n"
-                "Just type a topic name or ask me about it like 'Tell me about office hours'."
-            )
+            return _TOPICS_REPLY
         else:
             return "Hmm... I couldn't find any topics right now. Please check back later."
 
     # 8. Try to extract topic from natural queries like 'tell me about ...'
-    extracted_topic = extract_topic_from_query(query)
-    if extracted_topic and extracted_topic in chatbot_knowledge:
-        return f"📘 Here's what I found on **{extracted_topic.title()}**:\n\n{chatbot_knowledge[extracted_topic].strip()}"
-
-    # 9. Match known keywords anywhere in the query (keyword lookup)
-    for keyword, content in chatbot_knowledge.items():
-        if keyword in query:
-            return f"📘 Here's what I found on **{keyword.title()}**:\n\n{content.strip()}"
+    # 9. Otherwise match known keywords anywhere in the query (keyword lookup)
+    keyword = match_topic(query)
+    if keyword:
+        return f"📘 Here's what I found on **{keyword.title()}**:\n\n{get_topic_content(keyword).strip()}"
 
     # 10. Small talk / gratitude
     if match_intent(query, "small_talk"):
-        return random.choice([
-            "You're most welcome! 😊 Let me know if there's anything else you need.",
-            "Anytime! I'm here to help ⚡",
-            "Glad I could help! Ask away if you need more info."
-        ])
+        return _rng.choice(_SMALL_TALK_REPLIES)
 
     # 11. Fallback — no match
     return (